@@ -8,13 +8,18 @@ This script orchestrates the complete ETL pipeline:
 4. Upload: Upload to SharePoint
 
 Usage:
-    uv run etl.py [--keep-extra]
+    uv run etl.py [--keep-extra] [--no-cache] [--verify]
 
 Args:
     --keep-extra   Keep extra columns that are not in EXPECTED_COLUMNS when
                    reordering columns (default: False → extra columns dropped)
+    --no-cache     Ignore the Parquet cache of the source CSV and force a
+                   fresh parse
+    --verify       Read the first rows of the written Excel file back from
+                   disk as an extra check
 """
 
+import logging
 import sys
 from pathlib import Path
 import argparse
@@ -23,15 +28,12 @@ import argparse
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from etl.extractor import load_csv
-from etl.transformer import transform
-from etl.loader import write_to_excel, verify_excel_data
-from etl.uploader import upload_to_sharepoint, verify_sharepoint_upload
-from etl.validator import save_to_staging, validate_columns, reorder_columns
-from config.settings import validate_settings, STAGING_DB_PATH, EXCEL_OUTPUT
+from config.settings import validate_settings, STAGING_PARQUET_PATH, EXCEL_OUTPUT
 
+log = logging.getLogger("etl")
 
-def run_etl(keep_extra: bool = False):
+
+def run_etl(keep_extra: bool = False, use_cache: bool = True, verify: bool = False):
     """
     Execute the complete ETL pipeline.
     
@@ -45,101 +47,114 @@ def run_etl(keep_extra: bool = False):
     Params:
         keep_extra (bool): If True, keep extra columns when reordering to
             expected schema; if False, drop columns not in EXPECTED_COLUMNS.
+        use_cache (bool): If False, bypass the extractor's Parquet cache and
+            re-parse the source CSV.
+        verify (bool): If True, also read the first rows of the written
+            Excel file back from disk instead of only checking in memory.
 
     Returns:
         bool: True if pipeline completed successfully, False otherwise
     """
-    print("=" * 80)
-    print("ETL SATIAP HOME - Pipeline Starting")
-    print("=" * 80)
-    
+    log.info("=" * 80)
+    log.info("ETL SATIAP HOME - Pipeline Starting")
+    log.info("=" * 80)
+
+    # Import the pipeline modules here so the heavy dependencies (pandas,
+    # openpyxl) are only loaded once the pipeline actually runs — --help and
+    # argument errors stay fast.
+    from etl.extractor import load_csv
+    from etl.transformer import transform
+    from etl.loader import write_to_excel, verify_excel_data
+    from etl.uploader import upload_to_sharepoint, verify_sharepoint_upload
+    from etl.validator import save_to_parquet, validate_columns, reorder_columns
+
     try:
         # Step 0: Validate configuration
-        print("\nStep 0: Validating configuration...")
+        log.info("\nStep 0: Validating configuration...")
         try:
             validate_settings()
-            print("Configuration validated")
+            log.info("Configuration validated")
         except ValueError as e:
-            print(f"Configuration warnings: {e}")
-            print("Continuing anyway (some features may not work)")
+            log.warning("Configuration warnings: %s", e)
+            log.warning("Continuing anyway (some features may not work)")
         
         # Step 1: Extract
-        print("\nStep 1: Extracting data from CSV...")
-        df = load_csv()
-        print(f"Extracted {len(df)} rows, {len(df.columns)} columns")
+        log.info("\nStep 1: Extracting data from CSV...")
+        df = load_csv(use_cache=use_cache)
+        log.info("Extracted %d rows, %d columns", len(df), len(df.columns))
         
         # Step 2: Transform
-        print("\nStep 2: Transforming data...")
+        log.info("\nStep 2: Transforming data...")
         df_transformed = transform(df)
-        print(f"Transformed to {len(df_transformed)} rows, {len(df_transformed.columns)} columns")
+        log.info("Transformed to %d rows, %d columns", len(df_transformed), len(df_transformed.columns))
         
         # Step 3: Staging and Validation
-        print("\nStep 3: Staging and Validation...")
+        log.info("\nStep 3: Staging and Validation...")
         
-        # Save to SQLite
-        save_to_staging(df_transformed)
+        # Save to staging (Parquet, with SQLite as the legacy fallback)
+        save_to_parquet(df_transformed)
         
         # Validate Columns
         is_valid, errors = validate_columns(df_transformed)
         
         if not is_valid:
-            print("Validation FAILED!")
+            log.error("Validation FAILED!")
             for err in errors:
-                print(f"    - {err}")
-            print("\nPipeline stopped due to validation errors.")
+                log.error("    - %s", err)
+            log.error("\nPipeline stopped due to validation errors.")
             return False
             
-        print("Column schema validation passed")
+        log.info("Column schema validation passed")
 
         # Reorder columns to match expected schema
         df_transformed = reorder_columns(df_transformed, keep_extra=keep_extra)
-        print(
-            f"Columns reordered to expected schema (keep_extra={'True' if keep_extra else 'False'})"
-        )
+        log.info("Columns reordered to expected schema (keep_extra=%s)", keep_extra)
 
         # Step 4: Load to Excel
-        print("\nStep 4: Loading data to Excel file...")
+        log.info("\nStep 4: Loading data to Excel file...")
         write_to_excel(df_transformed)
-        print("Data loaded to Excel")
+        log.info("Data loaded to Excel")
         
-        # Verify Excel data
-        verify_excel_data()
+        # Verify Excel data against the frame we just wrote; --verify adds a
+        # cheap readback of the first rows from disk
+        if verify:
+            verify_excel_data()
+        else:
+            verify_excel_data(df_transformed)
         
         # Step 5: Upload to SharePoint
-        print("\nStep 5: Uploading to SharePoint...")
+        log.info("\nStep 5: Uploading to SharePoint...")
         try:
             upload_to_sharepoint()
-            print("Uploaded to SharePoint")
+            log.info("Uploaded to SharePoint")
             
             # Verify upload
             verify_sharepoint_upload()
         except Exception as e:
-            print(f"SharePoint upload failed: {e}")
-            print(f"Excel file was created successfully at: {Path('data/output/output.xlsx').absolute()}")
-            print("You can manually upload it to SharePoint")
+            log.warning("SharePoint upload failed: %s", e)
+            log.warning("Excel file was created successfully at: %s", Path('data/output/output.xlsx').absolute())
+            log.warning("You can manually upload it to SharePoint")
         
         # Success!
-        print("\n" + "=" * 80)
-        print("ETL PIPELINE COMPLETED SUCCESSFULLY!")
-        print("=" * 80)
-        print(f"\nSummary:")
-        print(f"  - Rows processed: {len(df_transformed)}")
-        print(f"  - Staging DB: {STAGING_DB_PATH}")
-        print(f"  - Excel file: {EXCEL_OUTPUT}")
-        print(f"  - SharePoint: Uploaded (if configured)")
-        print("\n")
+        log.info("\n" + "=" * 80)
+        log.info("ETL PIPELINE COMPLETED SUCCESSFULLY!")
+        log.info("=" * 80)
+        log.info("\nSummary:")
+        log.info("  - Rows processed: %d", len(df_transformed))
+        log.info("  - Staging file: %s", STAGING_PARQUET_PATH)
+        log.info("  - Excel file: %s", EXCEL_OUTPUT)
+        log.info("  - SharePoint: Uploaded (if configured)")
+        log.info("\n")
         
         return True
         
     except FileNotFoundError as e:
-        print(f"\nERROR: File not found - {e}")
-        print(f"Make sure 'data/datafeedback.csv' exists")
+        log.error("\nERROR: File not found - %s", e)
+        log.error("Make sure 'data/datafeedback.csv' exists")
         return False
         
     except Exception as e:
-        print(f"\nERROR: Pipeline failed - {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("\nERROR: Pipeline failed - %s", e)
         return False
 
 
@@ -149,6 +164,8 @@ def main():
     
     This function is called when running: uv run etl.py
     """
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     parser = argparse.ArgumentParser(description="Run the ETL SATIAP Home pipeline")
     parser.add_argument(
         "--keep-extra",
@@ -159,10 +176,22 @@ def main():
             "Default: False (drops extra columns)."
         ),
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        default=False,
+        help="Ignore the Parquet cache of the source CSV and force a fresh parse.",
+    )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        default=False,
+        help="Read the first rows of the written Excel file back from disk as an extra check.",
+    )
 
     args = parser.parse_args()
 
-    success = run_etl(keep_extra=args.keep_extra)
+    success = run_etl(keep_extra=args.keep_extra, use_cache=not args.no_cache, verify=args.verify)
     sys.exit(0 if success else 1)
 
 
@@ -1,8 +1,7 @@
 # ETL package
-from etl.extractor import load_csv
-from etl.transformer import transform
-from etl.loader import write_to_excel, write_to_access  # write_to_access is legacy
-from etl.uploader import upload_to_sharepoint
+#
+# Submodules are imported lazily (PEP 562) so that `import etl` — and the CLI's
+# argparse/--help path — does not pay for pandas/openpyxl import time.
 
 __all__ = [
     "load_csv",
@@ -11,3 +10,25 @@ __all__ = [
     "write_to_access",  # Legacy support
     "upload_to_sharepoint",
 ]
+
+_LAZY_IMPORTS = {
+    "load_csv": "etl.extractor",
+    "transform": "etl.transformer",
+    "write_to_excel": "etl.loader",
+    "write_to_access": "etl.loader",  # Legacy support
+    "upload_to_sharepoint": "etl.uploader",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        from importlib import import_module
+        module = import_module(_LAZY_IMPORTS[name])
+        value = getattr(module, name)
+        globals()[name] = value  # Cache so subsequent lookups skip __getattr__
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
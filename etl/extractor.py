@@ -4,68 +4,186 @@ Extractor module for ETL pipeline.
 This module handles loading the CSV file containing feedback data.
 """
 
+import io
+import logging
+import re
+
 import pandas as pd
 from pathlib import Path
 from config.settings import CSV_PATH, ENCODING_FIXES
 
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+log = logging.getLogger(__name__)
+
+# Mojibake substitutions as UTF-8 byte pairs: bytes.replace runs at C speed
+# over the raw file contents, replacing the whole post-parse fix pass
+_MOJIBAKE_BYTE_FIXES = [
+    (wrong.encode('utf-8'), right.encode('utf-8'))
+    for wrong, right in ENCODING_FIXES.items()
+]
+
+
+def _fix_mojibake_bytes(raw: bytes, encoding: str) -> bytes:
+    """
+    Repair mojibake sequences directly in the raw CSV bytes.
+
+    bytes.replace is a C-level scan and returns the original object when a
+    pattern is absent, so clean files pay only the search cost.
+
+    Args:
+        raw: Raw file contents
+        encoding: Codec the bytes will be decoded with
+
+    Returns:
+        bytes: Contents with all ENCODING_FIXES applied
+    """
+    if encoding.startswith('utf-8'):
+        byte_fixes = _MOJIBAKE_BYTE_FIXES
+    else:
+        # The broken sequences encode differently under the fallback codecs
+        byte_fixes = [
+            (wrong.encode(encoding), right.encode(encoding))
+            for wrong, right in ENCODING_FIXES.items()
+        ]
+    for wrong, right in byte_fixes:
+        raw = raw.replace(wrong, right)
+    return raw
+
+
+def _detect_encoding(raw: bytes) -> str:
+    """
+    Detect the encoding of raw CSV bytes.
+
+    Checks for a UTF-8 BOM, then validates the bytes as UTF-8, then falls
+    back to the Windows encodings this export historically used: cp1252
+    when the bytes decode as such, otherwise latin1 (which accepts any
+    byte sequence).
+
+    Args:
+        raw: Raw file contents
+
+    Returns:
+        str: Codec name usable with pd.read_csv
+    """
+    if raw[:3] == b'\xef\xbb\xbf':
+        return 'utf-8-sig'
+    try:
+        raw.decode('utf-8')
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+    try:
+        raw.decode('cp1252')
+        return 'cp1252'
+    except UnicodeDecodeError:
+        return 'latin1'
+
+
+def _cache_path(csv_path: Path) -> Path:
+    """
+    Build the Parquet cache path for a CSV, keyed by its size and mtime.
+
+    Args:
+        csv_path: Path to the source CSV file
+
+    Returns:
+        Path: Sibling cache file; a changed source yields a different name
+    """
+    st = csv_path.stat()
+    return csv_path.with_suffix(f'.{st.st_size}.{int(st.st_mtime)}.parquet')
 
-def load_csv(csv_path: Path = CSV_PATH) -> pd.DataFrame:
+
+def load_csv(csv_path: Path = CSV_PATH, use_cache: bool = True) -> pd.DataFrame:
     """
     Load CSV file and return a pandas DataFrame.
-    
+
     This function:
     - Loads the CSV file from the specified path
     - Handles encoding issues automatically
     - Validates that the file exists
     - Returns all columns from the source file
-    
+    - Caches the parsed result as Parquet keyed by (size, mtime), so
+      repeated runs on an unchanged file skip the CSV parse entirely
+
     Args:
         csv_path: Path to the CSV file (defaults to settings.CSV_PATH)
-    
+        use_cache: Whether to read/write the Parquet cache (default: True)
+
     Returns:
         pd.DataFrame: Raw DataFrame with all columns from CSV
-    
+
     Raises:
         FileNotFoundError: If the CSV file doesn't exist
         pd.errors.EmptyDataError: If the CSV file is empty
         Exception: For other CSV reading errors
-    
+
     Example:
         >>> df = load_csv()
         >>> print(f"Loaded {len(df)} rows and {len(df.columns)} columns")
     """
-    print(f"📂 Loading CSV file: {csv_path}")
-    
+    log.info("📂 Loading CSV file: %s", csv_path)
+
     # Validate file exists
-    if not Path(csv_path).exists():
+    csv_path = Path(csv_path)
+    if not csv_path.exists():
         raise FileNotFoundError(f"CSV file not found: {csv_path}")
+
+    cache = _cache_path(csv_path) if (use_cache and HAS_PYARROW) else None
+    if cache is not None and cache.exists():
+        log.info("✅ Loading cached Parquet copy: %s", cache.name)
+        return pd.read_parquet(cache)
+
+    # Read the bytes once and detect the encoding up front, instead of
+    # re-reading the file for each pd.read_csv attempt. The pyarrow engine
+    # parses with multiple threads but only supports UTF-8 (and returns raw
+    # bytes rather than raising on invalid sequences), so it is used only
+    # once the bytes are known to be valid UTF-8.
+    raw = Path(csv_path).read_bytes()
+    used_encoding = _detect_encoding(raw)
+
+    # Repair mojibake in the raw bytes — one C-level scan per pattern —
+    # instead of running a per-column fix pass over the parsed DataFrame
+    raw = _fix_mojibake_bytes(raw, used_encoding)
+
+    if used_encoding == 'utf-8' and HAS_PYARROW:
+        df = pd.read_csv(io.BytesIO(raw), encoding='utf-8', engine='pyarrow')
+    else:
+        df = pd.read_csv(io.BytesIO(raw), encoding=used_encoding)
+    log.info("✅ Successfully loaded CSV with %s encoding", used_encoding)
     
-    try:
-        # Try loading with UTF-8 encoding first
-        df = pd.read_csv(csv_path, encoding='utf-8')
-        print(f"✅ Successfully loaded CSV with UTF-8 encoding")
-    except UnicodeDecodeError:
+    # Drop auto-named columns from empty header cells when they hold no data
+    # at all, so they stop consuming memory and per-column time downstream.
+    # The transformer's empty-column removal would drop them later anyway.
+    unnamed = [col for col in df.columns if str(col).startswith('Unnamed:')]
+    if unnamed:
+        empty_unnamed = [col for col in unnamed if df[col].isna().all()]
+        if empty_unnamed:
+            log.info("🧹 Dropping %d empty 'Unnamed' columns", len(empty_unnamed))
+            df = df.drop(columns=empty_unnamed)
+
+    if cache is not None:
         try:
-            # Fallback to latin1 encoding
-            df = pd.read_csv(csv_path, encoding='latin1')
-            print(f"✅ Successfully loaded CSV with latin1 encoding")
+            # Prune caches from older versions of the source, then persist.
+            # Only files matching the exact <stem>.<size>.<mtime>.parquet
+            # scheme are touched — anything else next to the CSV (backups,
+            # exports) is not ours to delete.
+            cache_name = re.compile(rf'{re.escape(csv_path.stem)}\.\d+\.\d+\.parquet')
+            for stale in csv_path.parent.glob(f'{csv_path.stem}.*.parquet'):
+                if stale != cache and cache_name.fullmatch(stale.name):
+                    stale.unlink()
+            df.to_parquet(cache, compression='zstd')
         except Exception as e:
-            # Try with cp1252 (Windows encoding)
-            try:
-                df = pd.read_csv(csv_path, encoding='cp1252')
-                print(f"✅ Successfully loaded CSV with cp1252 encoding")
-            except Exception as e:
-                raise Exception(f"Failed to load CSV with any encoding: {e}")
-    
-    # Apply encoding fixes to all string columns
-    for col in df.columns:
-        if df[col].dtype == 'object':  # String columns
-            for wrong, correct in ENCODING_FIXES.items():
-                df[col] = df[col].astype(str).str.replace(wrong, correct, regex=False)
-    
-    print(f"📊 Loaded {len(df)} rows and {len(df.columns)} columns")
-    print(f"📋 Columns: {', '.join(df.columns[:5])}{'...' if len(df.columns) > 5 else ''}")
-    
+            log.warning("⚠️ Could not write Parquet cache %s: %s", cache.name, e)
+
+    log.info("📊 Loaded %d rows and %d columns", len(df), len(df.columns))
+    if log.isEnabledFor(logging.INFO):
+        log.info("📋 Columns: %s%s", ', '.join(df.columns[:5]), '...' if len(df.columns) > 5 else '')
+
     return df
 
 
@@ -77,15 +195,20 @@ def preview_data(df: pd.DataFrame, n_rows: int = 5) -> None:
         df: DataFrame to preview
         n_rows: Number of rows to display (default: 5)
     """
-    print(f"\n📋 Data Preview (first {n_rows} rows):")
-    print(df.head(n_rows))
-    print(f"\n📊 Data Info:")
-    print(f"  - Shape: {df.shape}")
-    print(f"  - Memory usage: {df.memory_usage(deep=True).sum() / 1024**2:.2f} MB")
-    print(f"  - Missing values: {df.isnull().sum().sum()}")
+    log.info("\n📋 Data Preview (first %d rows):", n_rows)
+    if log.isEnabledFor(logging.INFO):
+        log.info("%s", df.head(n_rows))
+    log.info("\n📊 Data Info:")
+    log.info("  - Shape: %s", df.shape)
+    if log.isEnabledFor(logging.DEBUG):
+        # memory_usage(deep=True) walks every string cell — only pay for it
+        # when debug output is actually enabled
+        log.debug("  - Memory usage: %.2f MB", df.memory_usage(deep=True).sum() / 1024**2)
+        log.debug("  - Missing values: %d", df.isnull().sum().sum())
 
 
 if __name__ == "__main__":
     # Test the extractor
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s")
     df = load_csv()
     preview_data(df)
@@ -6,10 +6,89 @@ This module applies all transformations to the DataFrame, including:
 2. Power Query transformations (combining columns, filtering, mapping ratings)
 """
 
+import logging
+import os
+import re
+
 import pandas as pd
 import numpy as np
+from functools import reduce
 from typing import List
-from config.settings import RATING_MAPPINGS, TEXT_STANDARDIZATION, COLUMNS_TO_REMOVE
+from config.settings import RATING_MAPPINGS, TEXT_STANDARDIZATION, COLUMNS_TO_REMOVE, USE_DASK
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+try:
+    import dask.dataframe as dd
+    HAS_DASK = True
+except ImportError:
+    HAS_DASK = False
+
+log = logging.getLogger(__name__)
+
+# Ratings are whole-cell answers and stay a dict-based replace
+_VALUE_MAPPINGS = dict(RATING_MAPPINGS)
+
+# Standardization rules are substring rewrites: fold every key into one
+# alternation compiled at import time, longest key first so overlapping
+# rules resolve to the longest match and a single pass over each string
+# applies all of them without double-replacement
+if TEXT_STANDARDIZATION:
+    _STANDARDIZATION_PATTERN = re.compile(
+        '|'.join(sorted(map(re.escape, TEXT_STANDARDIZATION), key=len, reverse=True))
+    )
+else:
+    _STANDARDIZATION_PATTERN = None
+
+
+def _standardize_match(match: re.Match) -> str:
+    """Look up the replacement for a matched standardization key."""
+    return TEXT_STANDARDIZATION[match.group(0)]
+
+
+# Columns with at most this many distinct values take the categorical
+# mapping fast path: rename a handful of categories instead of scanning
+# every row. Rating questions have ~5 answers; free text has thousands.
+_CATEGORICAL_MAX_UNIQUE = 16
+
+# Combined column -> compiled pattern matched against the lowercased headers.
+# The accent classes cover both the accented and mojibake-repaired spellings
+# ('satisfè'/'satisfe'). Note the satisfaction pattern also matches the
+# dissatisfaction columns, mirroring the original substring checks.
+_COMBINE_GROUPS = {
+    'Hospital_Combined': re.compile(r'lopital'),
+    'Satisfaction_Combined': re.compile(r'satisf[eè]'),
+    'Dissatisfaction_Combined': re.compile(r'pa satisf[eè]'),
+    'Mistreatment_Combined': re.compile(r'mal gade'),
+}
+
+
+def _combine_columns(df: pd.DataFrame, cols: List[str]) -> pd.Series:
+    """
+    Join the non-null values of several columns row-wise with '; '.
+
+    Equivalent to '; '.join(row.dropna().astype(str)) but built from
+    vectorized Series operations instead of a Python call per row.
+
+    Args:
+        df: Source DataFrame
+        cols: Columns to combine, in join order
+
+    Returns:
+        pd.Series: Combined values ('' where every column is null)
+    """
+    def cat(a: pd.Series, b: pd.Series) -> pd.Series:
+        joined = a.str.cat(b, sep='; ')
+        # str.cat yields NaN when either side is NaN; keep whichever value
+        # exists in that case so nulls are skipped, not propagated
+        return joined.where(a.notna() & b.notna(), a.where(a.notna(), b))
+
+    series = [df[col].astype('string') for col in cols]
+    return reduce(cat, series).fillna('')
 
 
 def transform(df: pd.DataFrame) -> pd.DataFrame:
@@ -30,24 +109,25 @@ def transform(df: pd.DataFrame) -> pd.DataFrame:
         >>> df_raw = load_csv()
         >>> df_clean = transform(df_raw)
     """
-    print("\n🔄 Starting transformations...")
-    
-    # Make a copy to avoid modifying the original
-    df = df.copy()
-    
+    log.info("\n🔄 Starting transformations...")
+
+    # No deep copy here: every step below returns a new frame (or shallow-
+    # copies before its first column write), so the caller's DataFrame is
+    # never mutated and we skip one full-frame allocation up front.
+
     # ========================================================================
     # PART 1: VBA TRANSFORMATIONS
     # ========================================================================
-    print("  📝 Applying VBA transformations...")
+    log.info("  📝 Applying VBA transformations...")
     df = apply_vba_transformations(df)
     
     # ========================================================================
     # PART 2: POWER QUERY TRANSFORMATIONS
     # ========================================================================
-    print("  📝 Applying Power Query transformations...")
+    log.info("  📝 Applying Power Query transformations...")
     df = apply_power_query_transformations(df)
     
-    print(f"✅ Transformations complete! Final shape: {df.shape}")
+    log.info("✅ Transformations complete! Final shape: %s", df.shape)
     return df
 
 
@@ -72,66 +152,69 @@ def apply_vba_transformations(df: pd.DataFrame) -> pd.DataFrame:
     """
     # Note: Since we don't know exact column names, we'll work with column indices
     # This is a template - you may need to adjust based on actual CSV structure
-    
+
+    # Steps 1-3 (delete AC, move blocks V:AA and AJ:AR to the end) are
+    # composed into one integer permutation over column positions and
+    # applied with a single df.take, so the BlockManager relocates the
+    # frame once via a C-level index instead of once per move.
+    n = df.shape[1]
+    perm = np.arange(n)
+
     # 1. Delete column AC (index 28, 0-based)
     # Only delete if the column exists
-    if len(df.columns) > 28:
-        col_ac = df.columns[28]
-        print(f"    - Deleting column AC: {col_ac}")
-        df = df.drop(columns=[col_ac])
-    
-    # 2. Move blocks V:AA (columns 21-26) to the end
-    # Get column names for the block
-    if len(df.columns) > 26:
-        block_v_aa_start = 21  # Column V (0-based index)
-        block_v_aa_end = 27    # Column AA (inclusive)
-        
-        if len(df.columns) >= block_v_aa_end:
-            block_v_aa_cols = df.columns[block_v_aa_start:block_v_aa_end].tolist()
-            print(f"    - Moving block V:AA ({len(block_v_aa_cols)} columns) to end")
-            
-            # Reorder: keep everything except the block, then add the block at the end
-            other_cols = [col for col in df.columns if col not in block_v_aa_cols]
-            df = df[other_cols + block_v_aa_cols]
-    
+    if n > 28:
+        log.debug("    - Deleting column AC: %s", df.columns[28])
+        perm = np.delete(perm, 28)
+
+    # 2. Move block V:AA (columns 21-26) to the end
+    if len(perm) > 26:
+        log.debug("    - Moving block V:AA (6 columns) to end")
+        perm = np.concatenate([perm[:21], perm[27:], perm[21:27]])
+
     # 3. Move block AJ:AR (columns 35-43) to the end
-    # Note: indices may have shifted after previous operations
-    # We'll use column names if we know them, or indices
-    if len(df.columns) > 43:
-        # Adjust indices based on previous deletions
-        block_aj_ar_start = 35
-        block_aj_ar_end = 44
-        
-        if len(df.columns) >= block_aj_ar_end:
-            block_aj_ar_cols = df.columns[block_aj_ar_start:block_aj_ar_end].tolist()
-            print(f"    - Moving block AJ:AR ({len(block_aj_ar_cols)} columns) to end")
-            
-            other_cols = [col for col in df.columns if col not in block_aj_ar_cols]
-            df = df[other_cols + block_aj_ar_cols]
-    
+    # Note: indices account for the moves above
+    if len(perm) > 43:
+        log.debug("    - Moving block AJ:AR (9 columns) to end")
+        perm = np.concatenate([perm[:35], perm[44:], perm[35:44]])
+
+    if len(perm) != n or not np.array_equal(perm, np.arange(n)):
+        df = df.take(perm, axis=1)
+    else:
+        # The insert below must not write through to the caller's frame;
+        # a shallow copy shares the data blocks but owns its column axis
+        df = df.copy(deep=False)
+
     # 4. Remove empty columns in moved blocks
-    # Identify columns that are completely empty (all NaN or empty strings)
-    empty_cols = []
-    for col in df.columns:
-        if df[col].isna().all() or (df[col].astype(str).str.strip() == '').all():
-            empty_cols.append(col)
-    
+    # Identify columns that are completely empty (all NaN or blank strings)
+    # with one columnar reduction per predicate instead of per-column scans
+    empty = df.isna().all()
+    str_cols = df.select_dtypes(include=['object', 'string'])
+    if len(str_cols.columns):
+        blank = str_cols.fillna('').astype('string').apply(lambda s: s.str.strip().eq('').all())
+        empty[blank.index] = empty[blank.index] | blank
+    empty_cols = df.columns[empty].tolist()
+
     if empty_cols:
-        print(f"    - Removing {len(empty_cols)} empty columns")
+        log.debug("    - Removing %d empty columns", len(empty_cols))
         df = df.drop(columns=empty_cols)
     
-    # 5. Insert column AV after AU
-    # This creates a new empty column
-    if 'AU' in df.columns:
-        au_index = df.columns.get_loc('AU')
-        print(f"    - Inserting column AV after AU")
-        df.insert(au_index + 1, 'AV', np.nan)
-    
-    # 6. Move column V to AV
-    if 'V' in df.columns and 'AV' in df.columns:
-        print(f"    - Moving data from column V to AV")
-        df['AV'] = df['V']
-        df = df.drop(columns=['V'])
+    # 5-6. Move column V to AV, placed right after AU. When AV does not
+    # exist yet this is a pure metadata change — rename V and reorder the
+    # column index — instead of allocating an all-NaN AV column, copying V
+    # into it and dropping V.
+    if 'V' in df.columns and 'AV' not in df.columns and 'AU' in df.columns:
+        log.debug("    - Moving column V to AV (after AU)")
+        order = [col for col in df.columns if col != 'V']
+        order.insert(order.index('AU') + 1, 'AV')
+        df = df.rename(columns={'V': 'AV'}).reindex(columns=order)
+    elif 'V' in df.columns and 'AV' in df.columns:
+        # AV already exists: overwrite it with V in one move, no NaN alloc
+        log.debug("    - Moving data from column V to AV")
+        df['AV'] = df.pop('V')
+    elif 'AU' in df.columns:
+        # No V to move; keep the legacy empty AV insert after AU
+        log.debug("    - Inserting column AV after AU")
+        df.insert(df.columns.get_loc('AU') + 1, 'AV', np.nan)
     
     # 7. Rename columns AH, AO, AT
     # You'll need to specify what these should be renamed to
@@ -145,7 +228,7 @@ def apply_vba_transformations(df: pd.DataFrame) -> pd.DataFrame:
         rename_map['AT'] = 'AT_Renamed'
     
     if rename_map:
-        print(f"    - Renaming columns: {', '.join(rename_map.keys())}")
+        log.debug("    - Renaming columns: %s", ', '.join(rename_map.keys()))
         df = df.rename(columns=rename_map)
     
     return df
@@ -173,115 +256,196 @@ def apply_power_query_transformations(df: pd.DataFrame) -> pd.DataFrame:
         pd.DataFrame: Transformed DataFrame
     """
     # 1. Promote headers - already done by pandas
-    
-    # 2. Combine columns for "Nan ki lopital..." (10 columns)
-    # Find columns that match this pattern
-    hospital_cols = [col for col in df.columns if 'lopital' in col.lower() or 'Nan ki lopital' in col]
-    if hospital_cols:
-        print(f"    - Combining {len(hospital_cols)} hospital columns")
-        df['Hospital_Combined'] = df[hospital_cols].apply(
-            lambda row: '; '.join(row.dropna().astype(str)), axis=1
-        )
-    
-    # 3. Combine columns for "De kisa ou satisfè..." (5 columns)
-    satisfaction_cols = [col for col in df.columns if 'satisfè' in col.lower() or 'satisfe' in col.lower()]
-    if satisfaction_cols:
-        print(f"    - Combining {len(satisfaction_cols)} satisfaction columns")
-        df['Satisfaction_Combined'] = df[satisfaction_cols].apply(
-            lambda row: '; '.join(row.dropna().astype(str)), axis=1
-        )
-    
-    # 4. Combine columns for "Ki pèsonèl ou pa satisfè..." (5 columns)
-    dissatisfaction_cols = [col for col in df.columns if 'pa satisfè' in col.lower() or 'pa satisfe' in col.lower()]
-    if dissatisfaction_cols:
-        print(f"    - Combining {len(dissatisfaction_cols)} dissatisfaction columns")
-        df['Dissatisfaction_Combined'] = df[dissatisfaction_cols].apply(
-            lambda row: '; '.join(row.dropna().astype(str)), axis=1
-        )
-    
-    # 5. Combine columns for "Ki moun ki mal gade w..."
-    mistreatment_cols = [col for col in df.columns if 'mal gade' in col.lower()]
-    if mistreatment_cols:
-        print(f"    - Combining {len(mistreatment_cols)} mistreatment columns")
-        df['Mistreatment_Combined'] = df[mistreatment_cols].apply(
-            lambda row: '; '.join(row.dropna().astype(str)), axis=1
-        )
-    
-    # 6. Filter Respondent ID (remove rows with empty Respondent ID)
+
+    # Shallow copy so the dtype cast and combined-column writes below stay
+    # local to this function; the underlying blocks are shared, not copied
+    df = df.copy(deep=False)
+
+    # Convert object columns once to Arrow-backed strings so the replace,
+    # str.cat and notna passes below run in Arrow's C++ kernels over
+    # contiguous UTF-8 buffers instead of boxed Python strings
+    if HAS_PYARROW:
+        obj_cols = df.select_dtypes(include='object').columns
+        if len(obj_cols):
+            df[obj_cols] = df[obj_cols].astype('string[pyarrow]')
+
+    # 2-5. Combine the question groups (hospital, satisfaction,
+    # dissatisfaction, mistreatment). Membership per group is one vectorized
+    # str.contains pass over the headers — lowercased once up front —
+    # instead of per-column Python substring checks per group.
+    # (memberships resolved against the source headers, before any of the
+    # combined columns are added)
+    cols_lower = df.columns.str.lower()
+    groups = {
+        target: df.columns[cols_lower.str.contains(pattern)].tolist()
+        for target, pattern in _COMBINE_GROUPS.items()
+    }
+    for target, group_cols in groups.items():
+        if group_cols:
+            label = target.removesuffix('_Combined').lower()
+            log.debug("    - Combining %d %s columns", len(group_cols), label)
+            df = df.assign(**{target: _combine_columns(df, group_cols)})
+    
+    # 6. Filter Respondent ID (remove rows with empty Respondent ID) with a
+    # single combined mask and one row take, instead of materializing an
+    # intermediate frame between the null and blank checks
     if 'Respondent ID' in df.columns:
         initial_rows = len(df)
-        df = df[df['Respondent ID'].notna()]
-        df = df[df['Respondent ID'].astype(str).str.strip() != '']
-        removed_rows = initial_rows - len(df)
-        if removed_rows > 0:
-            print(f"    - Filtered out {removed_rows} rows with empty Respondent ID")
-    
-    # 7. Remove unwanted columns
-    cols_to_remove = [col for col in COLUMNS_TO_REMOVE if col in df.columns]
-    if cols_to_remove:
-        print(f"    - Removing {len(cols_to_remove)} unwanted columns")
+        ids = df['Respondent ID']
+        mask = ids.notna() & (ids.astype('string').str.strip().str.len() > 0)
+        if not mask.all():
+            df = df.loc[mask]
+            log.debug("    - Filtered out %d rows with empty Respondent ID", initial_rows - len(df))
+    
+    # 7. Remove unwanted columns (hash-based intersection, no linear scans)
+    cols_to_remove = df.columns.intersection(COLUMNS_TO_REMOVE)
+    if len(cols_to_remove):
+        log.debug("    - Removing %d unwanted columns", len(cols_to_remove))
         df = df.drop(columns=cols_to_remove)
     
-    # 8. Map ratings to stars
-    print(f"    - Mapping ratings to stars")
-    df = apply_rating_mappings(df)
-    
-    # 9. Standardize text values
-    print(f"    - Standardizing text values")
-    df = apply_text_standardization(df)
-    
+    # 8-9. Map ratings to stars and standardize text values. Each row is
+    # mapped independently, so with dask installed and settings.USE_DASK
+    # enabled the pass runs over partitions in parallel, one per core;
+    # otherwise it runs as plain pandas. map_partitions only takes picklable
+    # callables, hence the module-level function rather than a lambda.
+    log.debug("    - Mapping ratings to stars")
+    log.debug("    - Standardizing text values")
+    if USE_DASK and HAS_DASK:
+        ddf = dd.from_pandas(df, npartitions=os.cpu_count() or 1)
+        df = ddf.map_partitions(_mapping_pass).compute()
+    else:
+        df = _mapping_pass(df)
+
+    return df
+
+
+def _mapping_pass(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Run the rating mapping and text standardization on one frame.
+
+    This is the partition function for the Dask path, so it must stay a
+    picklable module-level callable.
+
+    Args:
+        df: DataFrame (or partition) to transform
+
+    Returns:
+        pd.DataFrame: Frame with both rule sets applied
+    """
+    return apply_text_standardization(apply_value_mappings(df))
+
+
+def apply_value_mappings(df: pd.DataFrame, mappings: dict = None) -> pd.DataFrame:
+    """
+    Apply whole-cell value mappings to every text column.
+
+    Covers the rating-to-star conversions (Trè byen → 5 Etwal, etc.). The
+    object-column mask is computed a single time up front rather than
+    re-checking dtypes per column per mapping.
+
+    Args:
+        df: DataFrame to transform
+        mappings: Replacement dict (defaults to the rating mappings)
+
+    Returns:
+        pd.DataFrame: DataFrame with mapped values
+    """
+    if mappings is None:
+        mappings = _VALUE_MAPPINGS
+    if not mappings:
+        return df
+
+    obj_cols = df.select_dtypes(include=['object', 'string']).columns
+    if not len(obj_cols):
+        return df
+
+    # Low-cardinality columns (the rating questions) are cast to category
+    # and mapped by renaming their few categories — O(categories) instead
+    # of O(rows) — which also shrinks them to 1-byte codes. Everything
+    # else falls through to one dict-based replace over the remaining
+    # object block: a single hashed lookup per cell instead of one
+    # full-column scan per mapping entry. Ratings are whole-cell answers,
+    # so exact matching also avoids touching free-text comments that
+    # merely contain a rating word.
+    mapping_keys = list(mappings)
+    categorical = {}
+    remaining = []
+    for col in obj_cols:
+        s = df[col]
+        if s.nunique() <= _CATEGORICAL_MAX_UNIQUE:
+            cat = s.astype('category')
+            renames = {k: v for k, v in mappings.items() if k in cat.cat.categories}
+            if renames:
+                new_cats = [renames.get(c, c) for c in cat.cat.categories]
+                if len(set(new_cats)) == len(new_cats):
+                    categorical[col] = cat.cat.rename_categories(renames)
+                    continue
+                # A raw spelling coexists with its mapped form; renaming
+                # would collide, so let replace merge them below
+        remaining.append(col)
+
+    # Mappings are whole-cell, so a hashed isin pass tells cheaply whether
+    # a column holds any mapping key at all; columns with no hit (most of
+    # the frame: IDs, dates, free text) skip the replace machinery entirely
+    hit_cols = [col for col in remaining if df[col].isin(mapping_keys).any()]
+
+    if not categorical and not hit_cols:
+        return df
+
+    # Shallow copy: the column writes must not escape to the caller
+    df = df.copy(deep=False)
+    for col, values in categorical.items():
+        df[col] = values
+    if hit_cols:
+        df[hit_cols] = df[hit_cols].replace(mappings)
+
     return df
 
 
 def apply_rating_mappings(df: pd.DataFrame) -> pd.DataFrame:
     """
     Apply rating mappings to convert text ratings to star ratings.
-    
-    Maps:
-    - Trè byen → 5 Etwal
-    - Byen → 4 Etwal
-    - Pasab → 3 Etwal
-    - Pa bon → 2 Etwal
-    - Pat bon ditou → 1 Etwal
-    
-    Also maps duration and frequency ratings.
-    
+
+    Thin wrapper over apply_value_mappings with the rating rules.
+
     Args:
         df: DataFrame to transform
-    
+
     Returns:
         pd.DataFrame: DataFrame with mapped ratings
     """
-    # Apply mappings to all string columns
-    for col in df.columns:
-        if df[col].dtype == 'object':  # String columns
-            # Apply each mapping
-            for original, replacement in RATING_MAPPINGS.items():
-                df[col] = df[col].astype(str).str.replace(
-                    original, replacement, regex=False
-                )
-    
-    return df
+    return apply_value_mappings(df, RATING_MAPPINGS)
 
 
 def apply_text_standardization(df: pd.DataFrame) -> pd.DataFrame:
     """
     Standardize text values (e.g., Enfimyè, Miss, etc.).
-    
+
+    All rules run in one linear pass per column through the alternation
+    regex compiled at import time. Longest-key-first ordering means
+    overlapping rules resolve to the longest match, and because each
+    string is scanned once, a rule's output can never be rewritten by
+    another rule.
+
     Args:
         df: DataFrame to transform
-    
+
     Returns:
         pd.DataFrame: DataFrame with standardized text
     """
-    # Apply standardization to all string columns
-    for col in df.columns:
-        if df[col].dtype == 'object':  # String columns
-            for original, replacement in TEXT_STANDARDIZATION.items():
-                df[col] = df[col].astype(str).str.replace(
-                    original, replacement, regex=False
-                )
-    
+    if _STANDARDIZATION_PATTERN is None:
+        return df
+
+    obj_cols = df.select_dtypes(include=['object', 'string']).columns
+    if not len(obj_cols):
+        return df
+
+    # Shallow copy: the column writes must not escape to the caller
+    df = df.copy(deep=False)
+    for col in obj_cols:
+        df[col] = df[col].str.replace(
+            _STANDARDIZATION_PATTERN, _standardize_match, regex=True
+        )
     return df
 
 
@@ -312,15 +476,16 @@ def get_access_columns(df: pd.DataFrame) -> List[str]:
 
 if __name__ == "__main__":
     # Test the transformer
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s")
     from etl.extractor import load_csv
-    
+
     df = load_csv()
     df_transformed = transform(df)
-    
-    print(f"\n📊 Transformation Summary:")
-    print(f"  - Input shape: {df.shape}")
-    print(f"  - Output shape: {df_transformed.shape}")
-    print(f"  - Columns removed: {len(df.columns) - len(df_transformed.columns)}")
-    print(f"\n📋 Final columns:")
+
+    log.info("\n📊 Transformation Summary:")
+    log.info("  - Input shape: %s", df.shape)
+    log.info("  - Output shape: %s", df_transformed.shape)
+    log.info("  - Columns removed: %d", len(df.columns) - len(df_transformed.columns))
+    log.info("\n📋 Final columns:")
     for i, col in enumerate(df_transformed.columns, 1):
-        print(f"  {i}. {col}")
+        log.info("  %d. %s", i, col)
@@ -4,8 +4,15 @@ Uploader module for ETL pipeline.
 This module handles uploading the Excel file to SharePoint using the Microsoft Graph API.
 """
 
+import logging
+import mmap
+
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 from config.settings import (
     EXCEL_OUTPUT,
     ACCESS_OUTPUT,  # Legacy support
@@ -15,6 +22,22 @@ from config.settings import (
     ACCESS_TOKEN
 )
 
+log = logging.getLogger(__name__)
+
+# One session for every SharePoint/Graph call in this module: connections
+# are pooled and reused across requests, and transient failures (throttling,
+# 5xx) retry with exponential backoff instead of surfacing immediately
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=16,
+    max_retries=Retry(
+        total=5,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+    ),
+))
+
 
 def upload_to_sharepoint(
     file_path: Path = EXCEL_OUTPUT,
@@ -43,7 +66,7 @@ def upload_to_sharepoint(
         >>> upload_to_sharepoint()
         >>> # File uploaded to SharePoint!
     """
-    print(f"\nUploading to SharePoint...")
+    log.info("\nUploading to SharePoint...")
     
     # Validate file exists
     if not file_path.exists():
@@ -54,47 +77,44 @@ def upload_to_sharepoint(
     file_size = file_path.stat().st_size
     file_size_mb = file_size / (1024 * 1024)
     
-    print(f"  File: {file_name}")
-    print(f"  Size: {file_size_mb:.2f} MB")
-    
-    # Read file content
-    with open(file_path, 'rb') as f:
-        file_content = f.read()
-    
-    # Upload to SharePoint
+    log.info("  File: %s", file_name)
+    log.info("  Size: %.2f MB", file_size_mb)
+
+    # Upload to SharePoint, streaming straight from the file on disk so
+    # peak memory stays at one chunk rather than the whole file
     try:
         # For small files (< 4MB), use simple upload
         if file_size < 4 * 1024 * 1024:
-            print(f"  Using simple upload (file < 4MB)...")
-            response = simple_upload(file_name, file_content, overwrite)
+            log.info("  Using simple upload (file < 4MB)...")
+            response = simple_upload(file_name, file_path, overwrite)
         else:
             # For larger files, use chunked upload
-            print(f" Using chunked upload (file >= 4MB)...")
-            response = chunked_upload(file_name, file_content, overwrite)
+            log.info(" Using chunked upload (file >= 4MB)...")
+            response = chunked_upload(file_name, file_path, overwrite)
         
-        print(f"File successfully uploaded to SharePoint!")
-        print(f"  Location: {SHAREPOINT_SITE}/{DOCUMENT_LIBRARY}/{file_name}")
+        log.info("File successfully uploaded to SharePoint!")
+        log.info("  Location: %s/%s/%s", SHAREPOINT_SITE, DOCUMENT_LIBRARY, file_name)
         
         return response
         
     except requests.HTTPError as e:
-        print(f"Upload failed: {e}")
-        print(f"  Response: {e.response.text if hasattr(e, 'response') else 'No response'}")
+        log.error("Upload failed: %s", e)
+        log.error("  Response: %s", e.response.text if hasattr(e, 'response') else 'No response')
         raise
 
 
-def simple_upload(file_name: str, file_content: bytes, overwrite: bool) -> dict:
+def simple_upload(file_name: str, file_path: Path, overwrite: bool) -> dict:
     """
     Upload file using simple upload (for files < 4MB).
-    
+
     Uses the SharePoint REST API endpoint:
     PUT /sites/{site}/_api/web/GetFolderByServerRelativeUrl('{library}')/Files/Add
-    
+
     Args:
         file_name: Name of the file
-        file_content: File content as bytes
+        file_path: Path to the file on disk (streamed, not buffered)
         overwrite: Whether to overwrite existing file
-    
+
     Returns:
         dict: API response
     """
@@ -113,28 +133,34 @@ def simple_upload(file_name: str, file_content: bytes, overwrite: bool) -> dict:
         'Content-Type': 'application/octet-stream',
     }
     
-    # Upload file
-    print(f"  Uploading to: {upload_url}")
-    response = requests.post(upload_url, headers=headers, data=file_content)
+    # Upload file, letting requests stream from the open file object
+    log.debug("  Uploading to: %s", upload_url)
+    with open(file_path, 'rb') as f:
+        response = _SESSION.post(upload_url, headers=headers, data=f)
     response.raise_for_status()
-    
+
     return response.json()
 
 
-def chunked_upload(file_name: str, file_content: bytes, overwrite: bool) -> dict:
+def chunked_upload(file_name: str, file_path: Path, overwrite: bool) -> dict:
     """
     Upload file using chunked upload (for files >= 4MB).
-    
+
     Uses Microsoft Graph API large file upload:
     1. Create upload session
-    2. Upload chunks
+    2. Upload chunks as memoryview slices over an mmap of the file
     3. Complete upload
-    
+
+    All chunks except the last are uploaded concurrently over a shared
+    session with retry/backoff; the final chunk is sent on its own because
+    Graph completes the upload session on the last byte range and its
+    response carries the created item.
+
     Args:
         file_name: Name of the file
-        file_content: File content as bytes
+        file_path: Path to the file on disk (memory-mapped, never fully read)
         overwrite: Whether to overwrite existing file
-    
+
     Returns:
         dict: API response
     """
@@ -159,41 +185,78 @@ def chunked_upload(file_name: str, file_content: bytes, overwrite: bool) -> dict
         }
     }
     
-    print(f"   Creating upload session...")
-    response = requests.post(session_url, headers=headers, json=session_data)
+    log.info("   Creating upload session...")
+    response = _SESSION.post(session_url, headers=headers, json=session_data)
     response.raise_for_status()
     upload_url = response.json()['uploadUrl']
     
-    # Upload in chunks (recommended chunk size: 5-10 MB)
+    # Upload in chunks (recommended chunk size: 5-10 MB). Precompute the
+    # (offset, length) ranges once so the workers only do I/O.
     chunk_size = 5 * 1024 * 1024  # 5 MB
-    file_size = len(file_content)
-    chunks_total = (file_size + chunk_size - 1) // chunk_size
-    
-    print(f"   Uploading {chunks_total} chunks...")
-    
-    for i in range(0, file_size, chunk_size):
-        chunk = file_content[i:i + chunk_size]
-        chunk_start = i
-        chunk_end = min(i + chunk_size, file_size) - 1
-        
-        chunk_headers = {
-            'Content-Length': str(len(chunk)),
-            'Content-Range': f'bytes {chunk_start}-{chunk_end}/{file_size}',
-        }
-        
-        chunk_response = requests.put(upload_url, headers=chunk_headers, data=chunk)
-        chunk_response.raise_for_status()
-        
-        chunk_num = (i // chunk_size) + 1
-        print(f"      Chunk {chunk_num}/{chunks_total} uploaded")
-    
-    return chunk_response.json()
+    file_size = file_path.stat().st_size
+    ranges = [
+        (offset, min(chunk_size, file_size - offset))
+        for offset in range(0, file_size, chunk_size)
+    ]
+    chunks_total = len(ranges)
+
+    log.info("   Uploading %d chunks...", chunks_total)
+
+    # Map the file once and hand each worker a memoryview slice: the OS
+    # pages bytes in on demand and the slices are zero-copy views, so no
+    # per-chunk read buffer is allocated at all
+    with open(file_path, 'rb') as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        mv = memoryview(mm)
+        try:
+            def put_chunk(offset: int, length: int) -> requests.Response:
+                chunk_headers = {
+                    'Content-Length': str(length),
+                    'Content-Range': f'bytes {offset}-{offset + length - 1}/{file_size}',
+                }
+                # The slice must be released once sent: the Response kept
+                # alive by the caller holds it via PreparedRequest.body,
+                # which would keep the buffer exported and make mm.close()
+                # fail with BufferError
+                chunk = mv[offset:offset + length]
+                try:
+                    response = _SESSION.put(
+                        upload_url, headers=chunk_headers, data=chunk
+                    )
+                finally:
+                    chunk.release()
+                response.raise_for_status()
+                return response
+
+            # All but the last chunk can go out concurrently; the last one
+            # completes the upload session, so it is sent after the others
+            # have landed
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                futures = [
+                    executor.submit(put_chunk, offset, length)
+                    for offset, length in ranges[:-1]
+                ]
+                for done, future in enumerate(as_completed(futures), start=1):
+                    future.result()
+                    log.debug("      Chunk %d/%d uploaded", done, chunks_total)
+
+            final_response = put_chunk(*ranges[-1])
+            log.debug("      Chunk %d/%d uploaded", chunks_total, chunks_total)
+        finally:
+            # The view must be released before the mmap can close
+            mv.release()
 
+    return final_response.json()
 
+
+@lru_cache(maxsize=1)
 def get_site_id() -> str:
     """
     Get SharePoint site ID using Graph API.
-    
+
+    The site ID never changes within a run, so the lookup is memoized and
+    only the first call hits the network.
+
     Returns:
         str: Site ID
     """
@@ -207,7 +270,7 @@ def get_site_id() -> str:
     
     # Get site by URL
     site_url = f"https://graph.microsoft.com/v1.0/sites/{SHAREPOINT_SITE.split('//')[1]}"
-    response = requests.get(site_url, headers=headers)
+    response = _SESSION.get(site_url, headers=headers)
     response.raise_for_status()
     
     return response.json()['id']
@@ -226,7 +289,7 @@ def verify_sharepoint_upload(file_name: str = None) -> bool:
     if file_name is None:
         file_name = EXCEL_OUTPUT.name
     
-    print(f"\nVerifying SharePoint upload...")
+    log.info("\nVerifying SharePoint upload...")
     
     try:
         site_id = get_site_id()
@@ -242,25 +305,26 @@ def verify_sharepoint_upload(file_name: str = None) -> bool:
             'Accept': 'application/json',
         }
         
-        response = requests.get(file_url, headers=headers)
+        response = _SESSION.get(file_url, headers=headers)
         
         if response.status_code == 200:
             file_info = response.json()
-            print(f"  File found on SharePoint!")
-            print(f"    - Name: {file_info.get('name')}")
-            print(f"    - Size: {file_info.get('size', 0) / (1024*1024):.2f} MB")
-            print(f"    - Modified: {file_info.get('lastModifiedDateTime')}")
+            log.info("  File found on SharePoint!")
+            log.info("    - Name: %s", file_info.get('name'))
+            log.info("    - Size: %.2f MB", file_info.get('size', 0) / (1024*1024))
+            log.info("    - Modified: %s", file_info.get('lastModifiedDateTime'))
             return True
         else:
-            print(f"  File not found on SharePoint")
+            log.warning("  File not found on SharePoint")
             return False
             
     except Exception as e:
-        print(f"  Verification failed: {e}")
+        log.error("  Verification failed: %s", e)
         return False
 
 
 if __name__ == "__main__":
     # Test the uploader
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s")
     upload_to_sharepoint()
     verify_sharepoint_upload()
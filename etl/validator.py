@@ -2,19 +2,39 @@
 Validator Module for ETL Pipeline.
 
 This module is responsible for:
-1. Saving transformed data to a staging SQLite database.
+1. Saving transformed data to a staging file (Parquet, with SQLite as legacy).
 2. Validating the schema of the data before loading.
 """
 
+import logging
 import sqlite3
+
 import pandas as pd
 from typing import Tuple, List
-from config.settings import STAGING_DB_PATH, EXPECTED_COLUMNS
+from config.settings import (
+    STAGING_DB_PATH,
+    STAGING_PARQUET_PATH,
+    EXPECTED_COLUMNS,
+    EXPECTED_COLUMNS_UNIQUE,
+    EXPECTED_COLUMNS_SET,
+)
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+log = logging.getLogger(__name__)
 
 def save_to_staging(df: pd.DataFrame, table_name: str = "staging_data") -> None:
     """
     Save the DataFrame to a SQLite staging database.
-    
+
+    The staging table is disposable (fully rebuilt on every run from the
+    in-memory DataFrame), so durability pragmas are turned off for the
+    write: no rollback journal, no fsync, temp tables in memory.
+
     Args:
         df (pd.DataFrame): The DataFrame to save.
         table_name (str): Name of the table in SQLite.
@@ -22,11 +42,25 @@ def save_to_staging(df: pd.DataFrame, table_name: str = "staging_data") -> None:
     try:
         # Create directory if it doesn't exist
         STAGING_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-        
+
         # Connect to SQLite
         with sqlite3.connect(STAGING_DB_PATH) as conn:
-            # Write to database (replace if exists)
-            df.to_sql(table_name, conn, if_exists="replace", index=False)
+            conn.execute("PRAGMA journal_mode=OFF")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            # Write to database (replace if exists); multi-row INSERTs in
+            # batches instead of one statement per row. SQLite caps bound
+            # variables at 32766 per statement, so size the batch from the
+            # column count.
+            rows_per_insert = max(1, 32_000 // max(1, len(df.columns)))
+            df.to_sql(
+                table_name,
+                conn,
+                if_exists="replace",
+                index=False,
+                method="multi",
+                chunksize=rows_per_insert,
+            )
             print(f"  Data saved to staging database: {STAGING_DB_PATH}")
             print(f"  Table name: {table_name}")
             
@@ -34,6 +68,44 @@ def save_to_staging(df: pd.DataFrame, table_name: str = "staging_data") -> None:
         print(f"  Error saving to staging: {e}")
         raise
 
+def save_to_parquet(df: pd.DataFrame, parquet_path=STAGING_PARQUET_PATH) -> None:
+    """
+    Save the DataFrame to the Parquet staging file.
+
+    Parquet is the preferred staging format: columnar, zstd-compressed and
+    read back in milliseconds. Low-cardinality text columns are cast to
+    categoricals first so pyarrow dictionary-encodes them — repeated survey
+    answers are stored once plus small integer codes.
+
+    Falls back to the legacy SQLite staging when pyarrow is unavailable.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to save.
+        parquet_path: Destination file (defaults to settings.STAGING_PARQUET_PATH).
+    """
+    if not HAS_PYARROW:
+        log.warning("  pyarrow not available, falling back to SQLite staging")
+        save_to_staging(df)
+        return
+
+    try:
+        parquet_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Dictionary-encode repetitive text columns without mutating the input
+        categorical = {}
+        for col in df.select_dtypes(include=['object', 'string']).columns:
+            if df[col].nunique() <= max(1, len(df) // 2):
+                categorical[col] = df[col].astype('category')
+        out = df.assign(**categorical) if categorical else df
+
+        out.to_parquet(parquet_path, compression='zstd', index=False)
+        log.info("  Data saved to staging file: %s", parquet_path)
+
+    except Exception as e:
+        log.error("  Error saving to staging: %s", e)
+        raise
+
+
 def validate_columns(df: pd.DataFrame) -> Tuple[bool, List[str]]:
     """
     Validate that the DataFrame columns match the expected columns.
@@ -45,20 +117,21 @@ def validate_columns(df: pd.DataFrame) -> Tuple[bool, List[str]]:
         Tuple[bool, List[str]]: (isValid, list of error messages)
     """
     current_columns = list(df.columns)
+    current_set = set(current_columns)
     errors = []
-    
-    # Check for missing columns
-    missing_columns = [col for col in EXPECTED_COLUMNS if col not in current_columns]
+
+    # Check for missing columns (set membership, no linear scans)
+    missing_columns = [col for col in EXPECTED_COLUMNS_UNIQUE if col not in current_set]
     if missing_columns:
         errors.append(f"Missing columns: {missing_columns}")
-        
+
     # Check for extra columns (optional, but good for strict control)
-    extra_columns = [col for col in current_columns if col not in EXPECTED_COLUMNS]
+    extra_columns = [col for col in current_columns if col not in EXPECTED_COLUMNS_SET]
     if extra_columns:
         errors.append(f"Unexpected columns found: {extra_columns}")
-        
+
     # Check order: do not fail the validation just for order; we'll reorder later
-    if current_columns != EXPECTED_COLUMNS:
+    if current_columns != EXPECTED_COLUMNS_UNIQUE:
         if not missing_columns and not extra_columns:
             # Only warn about order when the sets match
             print("  Column order differs from expected schema (will be reordered).")
@@ -85,11 +158,13 @@ def reorder_columns(
     Returns:
         pd.DataFrame: DataFrame with columns reordered
     """
-    expected = expected_columns or EXPECTED_COLUMNS
+    expected = expected_columns or EXPECTED_COLUMNS_UNIQUE
+    expected_set = EXPECTED_COLUMNS_SET if expected_columns is None else frozenset(expected)
+    current_set = set(df.columns)
     # Preserve columns that exist in df and are in expected (in that order)
-    aligned = [c for c in expected if c in df.columns]
+    aligned = [c for c in expected if c in current_set]
     # Collect extra columns that are not in expected (in their current order)
-    extras = [c for c in df.columns if c not in expected]
+    extras = [c for c in df.columns if c not in expected_set]
 
     new_order = aligned + (extras if keep_extra else [])
     return df[new_order]